@@ -10,7 +10,7 @@ import uuid
 from typing import Tuple, List, Optional, Dict, Any
 from contextlib import contextmanager
 from dataclasses import dataclass
-from functools import lru_cache
+from numba import njit
 
 # Configurar logging específico para la lógica del juego
 logging.basicConfig(
@@ -36,6 +36,217 @@ class DatabaseError(Exception):
     """Excepción personalizada para errores de base de datos"""
     pass
 
+# Cotas enteras de la búsqueda; una victoria vale WIN_SCORE más la
+# profundidad restante, de modo que se prefieren las victorias más rápidas
+INF = 10**9
+WIN_SCORE = INF // 2
+
+# Tipos de entrada en la tabla de transposición
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Sentencias SQL de escritura, preparadas una vez y reutilizadas por la caché
+# de sentencias de la conexión
+_SQL_INSERT_GAME = '''
+    INSERT INTO games (
+        game_id, initial_player, timestamp, dificultad,
+        filas, columnas, nivel_dificultad
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_MOVE = '''
+    INSERT INTO moves (player, timestamp, game_id, column, help)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_UPDATE_STATS = '''
+    UPDATE games
+    SET winner_player = ?,
+        tiempo_juego = ?,
+        jugadas_humano = ?,
+        jugadas_ia = ?,
+        sugerencias_usadas = ?,
+        tiempo_total_ia = ?,
+        nodos_explorados = ?,
+        promedio_tiempo_jugada_ia = ?,
+        nivel_dificultad = ?
+    WHERE game_id = ?
+'''
+
+_U1 = np.uint64(1)
+
+# Núcleo de búsqueda compilado con Numba. El tablero se representa con un
+# bitboard uint64 por jugador (pieces[0] jugador, pieces[1] IA) y una máscara de
+# casillas ocupadas; las tablas geométricas las prepara ConnectFour.
+
+@njit(cache=True)
+def _bit_count(x):
+    """Cuenta los bits encendidos de x sin saltos (popcount SWAR)"""
+    x = x - ((x >> _U1) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return np.int64((x * np.uint64(0x0101010101010101)) >> np.uint64(56))
+
+@njit(cache=True)
+def _has_four(board, shifts, starts):
+    """Verifica si un bitboard contiene cuatro fichas en línea"""
+    for i in range(shifts.size):
+        shift = shifts[i]
+        m = board & (board >> shift)
+        if m & (m >> (shift + shift)) & starts[i]:
+            return True
+    return False
+
+@njit(cache=True)
+def _windows_score(pieces, bit, through_masks, window_score):
+    """
+    Suma la puntuación para la IA de las ventanas que contienen el bit dado
+
+    through_masks[bit] lista las máscaras de esas ventanas rellenando con 0,
+    que puntúa 0, de modo que el recorrido tiene largo fijo y sin saltos.
+    """
+    ai = pieces[1]
+    player = pieces[0]
+    total = 0
+    masks = through_masks[bit]
+    for i in range(masks.size):
+        wm = masks[i]
+        total += window_score[_bit_count(ai & wm), _bit_count(player & wm)]
+    return total
+
+@njit(cache=True, nogil=True)
+def _negamax(pieces, mask, key, score, heights, depth, alpha, beta, color,
+             geometry, tt, killers, moves_buf, stats):
+    """
+    Negamax con poda Alfa-Beta, tabla de transposición y jugadas killer
+
+    pieces y heights se modifican durante la búsqueda y se restauran al salir;
+    mask, key (hash Zobrist) y score (evaluación para la IA) se pasan por valor.
+    La posición recibida no debe tener cuatro en línea: cada nodo resuelve antes
+    de descender las jugadas que ganan de inmediato, así que ningún hijo las tiene.
+
+    Returns:
+        (valor para quien mueve, mejor columna o -1)
+    """
+    (rows, center, board_mask, bottom, column_mask, top, shifts, starts, order,
+     through_masks, window_score, zobrist) = geometry
+    tt_keys, tt_values, tt_depths, tt_flags, tt_moves = tt
+    stats[0] += 1
+
+    # Verificar estados terminales
+    if mask == board_mask:
+        return 0, -1
+    if depth == 0:
+        return color * score, -1
+
+    # Consultar la tabla de transposición
+    alpha_orig = alpha
+    slot = np.int64(key & np.uint64(tt_keys.size - 1))
+    tt_move = -1
+    if tt_keys[slot] == key:
+        tt_move = np.int64(tt_moves[slot])
+        if tt_depths[slot] >= depth:
+            tt_value = tt_values[slot]
+            if tt_flags[slot] == TT_EXACT:
+                return tt_value, tt_move
+            if tt_flags[slot] == TT_LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value, tt_move
+
+    piece = 1 if color == 1 else 0
+    opp = 1 - piece
+
+    # Ordenar: jugada de la tabla, jugada killer y el resto del centro hacia afuera
+    moves = moves_buf[depth]
+    killer = killers[depth]
+    n = 0
+    if tt_move >= 0 and not (mask & top[tt_move]):
+        moves[n] = tt_move
+        n += 1
+    if killer >= 0 and killer != tt_move and not (mask & top[killer]):
+        moves[n] = killer
+        n += 1
+    for i in range(order.size):
+        col = order[i]
+        if col != tt_move and col != killer and not (mask & top[col]):
+            moves[n] = col
+            n += 1
+
+    # Ganar de inmediato si es posible
+    for i in range(n):
+        col = moves[i]
+        move = (mask + bottom[col]) & column_mask[col]
+        if _has_four(pieces[piece] | move, shifts, starts):
+            return WIN_SCORE + depth - 1, col
+
+    # Amenazas inmediatas del rival: con dos o más no hay defensa,
+    # con una sola la única jugada a considerar es bloquearla
+    if depth >= 2:
+        threats = 0
+        block = -1
+        for i in range(n):
+            col = moves[i]
+            move = (mask + bottom[col]) & column_mask[col]
+            if _has_four(pieces[opp] | move, shifts, starts):
+                threats += 1
+                if block < 0:
+                    block = col
+        if threats > 1:
+            return -(WIN_SCORE + depth - 2), block
+        if threats == 1:
+            moves[0] = block
+            n = 1
+
+    value = -INF
+    best = moves[0]
+    for i in range(n):
+        col = moves[i]
+        move = (mask + bottom[col]) & column_mask[col]
+        bit = col * rows + heights[col]
+
+        delta = -_windows_score(pieces, bit, through_masks, window_score)
+        pieces[piece] ^= move
+        delta += _windows_score(pieces, bit, through_masks, window_score)
+        if piece == 1 and col == center:
+            delta += 3
+        heights[col] += 1
+
+        new_score = -_negamax(pieces, mask | move, key ^ zobrist[piece, bit], score + delta,
+                              heights, depth - 1, -beta, -alpha, -color,
+                              geometry, tt, killers, moves_buf, stats)[0]
+
+        # Deshacer movimiento
+        heights[col] -= 1
+        pieces[piece] ^= move
+
+        if new_score > value:
+            value = new_score
+            best = col
+        alpha = max(alpha, value)
+
+        if alpha >= beta:
+            killers[depth] = col
+            break
+
+    # Guardar el resultado con el tipo de cota según la ventana original
+    if value <= alpha_orig:
+        flag = TT_UPPER
+    elif value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    tt_keys[slot] = key
+    tt_values[slot] = value
+    tt_depths[slot] = depth
+    tt_flags[slot] = flag
+    tt_moves[slot] = best
+    return value, best
+
 class ConnectFour:
     """Implementación del juego Connect Four con IA"""
 
@@ -43,8 +254,10 @@ class ConnectFour:
     MIN_BOARD_SIZE = 4
     MAX_BOARD_SIZE = 8
     VALID_DIFFICULTIES = {1, 2, 3}
-    MAX_GAME_HISTORY = 100
     DB_TIMEOUT = 5.0
+    MOVE_BATCH_SIZE = 16  # Movimientos acumulados antes de escribirlos en la base de datos
+
+    TT_SIZE_BITS = 20  # La tabla de transposición tiene 2^20 entradas
 
     def __init__(self, rows: int = 6, columns: int = 7, difficulty: int = 2,
                  initial_player: str = "HUMAN", db_path: str = 'connect_four.db'):
@@ -69,9 +282,10 @@ class ConnectFour:
         self.ROWS = rows
         self.COLUMNS = columns
         self.DIFFICULTY = difficulty
-        self.PLAYER = 0
-        self.AI = 1
-        self.EMPTY = None
+        self.EMPTY = 0
+        self.PLAYER = 1
+        self.AI = 2
+        self.OPPONENT = {self.PLAYER: self.AI, self.AI: self.PLAYER}
         self.WINDOW_LENGTH = 4
         self.initial_player = initial_player
         self.db_path = db_path
@@ -84,13 +298,88 @@ class ConnectFour:
         self.depth_map = {1: 2, 2: 4, 3: 6}
         self.search_depth = self.depth_map[difficulty]
 
-        # Inicialización del tablero
-        self.board = [[self.EMPTY] * columns for _ in range(rows)]
+        # Presupuesto de tiempo (segundos) para la profundización iterativa
+        self.time_budget_map = {1: 1.0, 2: 2.0, 3: 5.0}
+
+        # Inicialización del tablero: arreglo plano de bytes, fila por fila
+        self.board = bytearray(rows * columns)
+
+        # Bitboards: un entero por jugador y una máscara de casillas ocupadas.
+        # La celda (fila r contada desde abajo, columna c) es el bit c*ROWS + r,
+        # por lo que cualquier tablero de hasta 8x8 cabe en un uint64.
+        self.pieces = {self.PLAYER: 0, self.AI: 0}
+        self.mask = 0
+        self.heights = [0] * columns
+        self.bottom_mask = [1 << (c * rows) for c in range(columns)]
+        self.column_mask = [((1 << rows) - 1) << (c * rows) for c in range(columns)]
+        self.top_mask = [1 << (rows - 1 + c * rows) for c in range(columns)]
+        self.board_mask = sum(self.column_mask)
+
+        # Orden de las columnas: del centro hacia los extremos
+        self.column_order = tuple(sorted(range(columns), key=lambda c: abs(c - columns // 2)))
+
+        # Detección de cuatro en línea: desplazamiento de cada dirección
+        # (vertical, horizontal, diagonal ascendente y descendente) y máscara
+        # de las celdas donde puede empezar una línea sin salirse del tablero
+        directions = ((1, 0), (0, 1), (1, 1), (-1, 1))
+        self.win_shifts = [dc * rows + dr for dr, dc in directions]
+        self.win_starts = [
+            sum(1 << (c * rows + r)
+                for c in range(columns) for r in range(rows)
+                if 0 <= r + 3 * dr < rows and c + 3 * dc < columns)
+            for dr, dc in directions
+        ]
+
+        # Evaluación: máscara de cada ventana de 4 casillas, ventanas que pasan
+        # por cada bit y puntuación según (fichas de la IA, fichas del jugador)
+        self.window_masks = [
+            sum(1 << self._bit(row, col) for row, col in window)
+            for window in self._build_windows()
+        ]
+        self.windows_through: List[List[int]] = [[] for _ in range(rows * columns)]
+        for index, window_mask in enumerate(self.window_masks):
+            for bit in range(rows * columns):
+                if window_mask >> bit & 1:
+                    self.windows_through[bit].append(index)
+        self.window_score = [
+            [self._score_window((self.AI,) * own + (self.PLAYER,) * opp
+                                + (self.EMPTY,) * (self.WINDOW_LENGTH - own - opp), self.AI)
+             if own + opp <= self.WINDOW_LENGTH else 0
+             for opp in range(self.WINDOW_LENGTH + 1)]
+            for own in range(self.WINDOW_LENGTH + 1)
+        ]
+
+        # Puntuación del tablero para la IA, actualizada en _place
+        self.score = 0
+
+        # Claves Zobrist por (jugador, bit) y hash incremental del tablero
+        self.zobrist = np.random.randint(0, 2**63, size=(2, rows * columns), dtype=np.uint64)
+        self._zobrist_keys = dict(zip((self.PLAYER, self.AI), self.zobrist.tolist()))
+        self.hash = 0
+
+        # Estructuras de la búsqueda compilada
+        self._init_search_tables()
 
         # ID único para esta partida
         self.game_id = str(uuid.uuid4())
+        # Movimientos pendientes de escribir en la base de datos
+        self._pending_moves: List[Tuple[str, datetime, str, int, bool]] = []
 
         try:
+            # Conexión única durante toda la partida (modo autocommit)
+            self.conn = sqlite3.connect(
+                db_path,
+                timeout=self.DB_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=64
+            )
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA temp_store=MEMORY')
+            self.conn.execute('PRAGMA cache_size=-20000')
+
             # Inicialización de la base de datos
             self.initialize_database()
             # Registrar inicio de partida
@@ -117,18 +406,12 @@ class ConnectFour:
 
     @contextmanager
     def get_db_connection(self):
-        """Context manager para manejar la conexión a la base de datos de forma segura"""
-        conn = None
+        """Context manager que entrega la conexión compartida de la partida"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=self.DB_TIMEOUT)
-            conn.row_factory = sqlite3.Row
-            yield conn
+            yield self.conn
         except sqlite3.Error as e:
             logging.error(f"Error en la base de datos: {e}")
             raise DatabaseError(f"Error al conectar con la base de datos: {e}")
-        finally:
-            if conn:
-                conn.close()
 
     def initialize_database(self) -> None:
         """Inicializa la base de datos SQLite con las tablas necesarias"""
@@ -173,8 +456,10 @@ class ConnectFour:
                 # Crear índices para optimizar consultas
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_moves_game_id ON moves(game_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_games_timestamp ON games(timestamp)')
-
-                conn.commit()
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_games_finished
+                ON games(timestamp DESC) WHERE winner_player IS NOT NULL
+                ''')
 
         except sqlite3.Error as e:
             logging.error(f"Error al inicializar la base de datos: {e}")
@@ -184,14 +469,7 @@ class ConnectFour:
         """Registra una nueva partida en la base de datos"""
         try:
             with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                INSERT INTO games (
-                    game_id, initial_player, timestamp, dificultad,
-                    filas, columnas, nivel_dificultad
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                conn.execute(_SQL_INSERT_GAME, (
                     self.game_id,
                     self.initial_player,
                     datetime.now(),
@@ -200,7 +478,6 @@ class ConnectFour:
                     self.COLUMNS,
                     self.DIFFICULTY
                 ))
-                conn.commit()
         except sqlite3.Error as e:
             logging.error(f"Error al registrar nuevo juego: {e}")
             raise DatabaseError(f"Error al registrar el juego: {e}")
@@ -220,23 +497,28 @@ class ConnectFour:
         if not (0 <= column < self.COLUMNS):
             raise ValueError("Columna inválida")
 
+        self._pending_moves.append((player, datetime.now(), self.game_id, column, help_used))
+        if len(self._pending_moves) >= self.MOVE_BATCH_SIZE:
+            self._flush_moves()
+
+    def _flush_moves(self) -> None:
+        """Escribe los movimientos pendientes en una sola transacción"""
+        if not self._pending_moves:
+            return
+
         try:
             with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                INSERT INTO moves (player, timestamp, game_id, column, help)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    player,
-                    datetime.now(),
-                    self.game_id,
-                    column,
-                    help_used
-                ))
-                conn.commit()
+                conn.execute('BEGIN')
+                try:
+                    conn.executemany(_SQL_INSERT_MOVE, self._pending_moves)
+                    conn.execute('COMMIT')
+                except sqlite3.Error:
+                    conn.execute('ROLLBACK')
+                    raise
+            self._pending_moves.clear()
         except sqlite3.Error as e:
-            logging.error(f"Error al registrar movimiento: {e}")
-            raise DatabaseError(f"Error al registrar el movimiento: {e}")
+            logging.error(f"Error al registrar movimientos: {e}")
+            raise DatabaseError(f"Error al registrar los movimientos: {e}")
 
     def register_game_stats(self, stats_data: Dict[str, Any]) -> None:
         """
@@ -246,51 +528,51 @@ class ConnectFour:
             stats_data: Diccionario con las estadísticas del juego
         """
         try:
+            # Los movimientos pendientes y las estadísticas se confirman juntos
             with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                UPDATE games
-                SET winner_player = ?,
-                    tiempo_juego = ?,
-                    jugadas_humano = ?,
-                    jugadas_ia = ?,
-                    sugerencias_usadas = ?,
-                    tiempo_total_ia = ?,
-                    nodos_explorados = ?,
-                    promedio_tiempo_jugada_ia = ?,
-                    nivel_dificultad = ?
-                WHERE game_id = ?
-                ''', (
-                    stats_data['winner'],
-                    stats_data['tiempo_juego'],
-                    stats_data['jugadas_humano'],
-                    stats_data['jugadas_ia'],
-                    stats_data['sugerencias_usadas'],
-                    stats_data['tiempo_total_ia'],
-                    stats_data['nodos_explorados'],
-                    stats_data['promedio_tiempo_jugada_ia'],
-                    stats_data['nivel_dificultad'],
-                    self.game_id
-                ))
-                conn.commit()
+                conn.execute('BEGIN')
+                try:
+                    if self._pending_moves:
+                        conn.executemany(_SQL_INSERT_MOVE, self._pending_moves)
+                    conn.execute(_SQL_UPDATE_STATS, (
+                        stats_data['winner'],
+                        stats_data['tiempo_juego'],
+                        stats_data['jugadas_humano'],
+                        stats_data['jugadas_ia'],
+                        stats_data['sugerencias_usadas'],
+                        stats_data['tiempo_total_ia'],
+                        stats_data['nodos_explorados'],
+                        stats_data['promedio_tiempo_jugada_ia'],
+                        stats_data['nivel_dificultad'],
+                        self.game_id
+                    ))
+                    conn.execute('COMMIT')
+                except sqlite3.Error:
+                    conn.execute('ROLLBACK')
+                    raise
+            self._pending_moves.clear()
         except sqlite3.Error as e:
             logging.error(f"Error al registrar estadísticas: {e}")
             raise DatabaseError(f"Error al actualizar las estadísticas: {e}")
 
-    @lru_cache(maxsize=1024)
     def get_valid_moves(self) -> List[int]:
-        """Retorna una lista de columnas disponibles para jugar"""
-        return [col for col in range(self.COLUMNS) if self.is_valid_move(col)]
+        """Retorna las columnas disponibles para jugar, del centro hacia los extremos"""
+        mask, top_mask = self.mask, self.top_mask
+        return [col for col in self.column_order if not (mask & top_mask[col])]
+
+    def is_full(self) -> bool:
+        """Verifica si el tablero está lleno (empate si nadie ha ganado)"""
+        return self.mask == self.board_mask
 
     def is_valid_move(self, col: int) -> bool:
         """Verifica si una columna está disponible para colocar una ficha"""
         if not (0 <= col < self.COLUMNS):
             return False
-        return self.board[0][col] == self.EMPTY
+        return not (self.mask & self.top_mask[col])
 
-    def drop_piece(self, col: int, piece: int, help_used: bool = False) -> Tuple[int, int]:
+    def apply_move(self, col: int, piece: int, help_used: bool = False) -> Tuple[int, int]:
         """
-        Coloca una ficha en la columna especificada
+        Realiza una jugada real de la partida y la registra en la base de datos
 
         Args:
             col: Columna donde colocar la ficha
@@ -306,15 +588,32 @@ class ConnectFour:
         if not self.is_valid_move(col):
             raise ValueError("Movimiento inválido")
 
-        for row in range(self.ROWS-1, -1, -1):
-            if self.board[row][col] == self.EMPTY:
-                self.board[row][col] = piece
-                # Registrar movimiento
-                player = "HUMAN" if piece == self.PLAYER else "AI"
-                self.register_move(player, col, help_used)
-                return row, col
-
-        raise ValueError("Columna llena")
+        row, col = self._place(col, piece)
+
+        # Registrar movimiento
+        player = "HUMAN" if piece == self.PLAYER else "AI"
+        self.register_move(player, col, help_used)
+        return row, col
+
+    def _bit(self, row: int, col: int) -> int:
+        """Índice en el bitboard de la celda (row, col) del tablero"""
+        return col * self.ROWS + (self.ROWS - 1 - row)
+
+    def _place(self, col: int, piece: int) -> Tuple[int, int]:
+        """Coloca una ficha sin validar ni registrar"""
+        move = (self.mask + self.bottom_mask[col]) & self.column_mask[col]
+        bit = col * self.ROWS + self.heights[col]
+        self.score -= self._windows_score(bit)
+        self.pieces[piece] ^= move
+        self.mask ^= move
+        self.score += self._windows_score(bit)
+        if piece == self.AI and col == self.COLUMNS // 2:
+            self.score += 3
+        row = self.ROWS - 1 - self.heights[col]
+        self.heights[col] += 1
+        self.board[row * self.COLUMNS + col] = piece
+        self.hash ^= self._zobrist_keys[piece][bit]
+        return row, col
 
     def check_winner(self, piece: int) -> bool:
         """
@@ -326,41 +625,17 @@ class ConnectFour:
         Returns:
             bool: True si el jugador ha ganado
         """
-        # Verificar horizontal
-        for row in range(self.ROWS):
-            for col in range(self.COLUMNS - 3):
-                window = [self.board[row][col+i] for i in range(4)]
-                if len([x for x in window if x == piece]) == 4:
-                    return True
-
-        # Verificar vertical
-        for row in range(self.ROWS - 3):
-            for col in range(self.COLUMNS):
-                window = [self.board[row+i][col] for i in range(4)]
-                if len([x for x in window if x == piece]) == 4:
-                    return True
-
-        # Verificar diagonal positiva
-        for row in range(self.ROWS - 3):
-            for col in range(self.COLUMNS - 3):
-                window = [self.board[row+i][col+i] for i in range(4)]
-                if len([x for x in window if x == piece]) == 4:
-                    return True
-
-        # Verificar diagonal negativa
-        for row in range(3, self.ROWS):
-            for col in range(self.COLUMNS - 3):
-                window = [self.board[row-i][col+i] for i in range(4)]
-                if len([x for x in window if x == piece]) == 4:
-                    return True
-
+        board = self.pieces[piece]
+        for shift, starts in zip(self.win_shifts, self.win_starts):
+            m = board & (board >> shift)
+            if m & (m >> (2 * shift)) & starts:
+                return True
         return False
 
-    @lru_cache(maxsize=1024)
-    def evaluate_window(self, window: Tuple[Optional[int], ...], piece: int) -> int:
-        """Evalúa una ventana de 4 posiciones"""
+    def _score_window(self, window: Tuple[int, ...], piece: int) -> int:
+        """Calcula la puntuación de una ventana de 4 posiciones contando sus fichas"""
         score = 0
-        opp_piece = self.PLAYER if piece == self.AI else self.AI
+        opp_piece = self.OPPONENT[piece]
 
         piece_count = window.count(piece)
         empty_count = window.count(self.EMPTY)
@@ -378,120 +653,159 @@ class ConnectFour:
 
         return score
 
-    def evaluate_position(self) -> int:
-            """
-            Evalúa el estado actual del tablero para la IA
-
-            Returns:
-                int: Puntuación del estado actual del tablero
-            """
-            score = 0
-
-            # Evaluar centro (preferencia por el control del centro)
-            center_array = tuple(self.board[row][self.COLUMNS//2] for row in range(self.ROWS))
-            center_count = len([x for x in center_array if x == self.AI])
-            score += center_count * 3
-
-            # Evaluar horizontal
-            for row in range(self.ROWS):
-                row_array = self.board[row]
-                for col in range(self.COLUMNS - 3):
-                    window = tuple(row_array[col:col + self.WINDOW_LENGTH])
-                    score += self.evaluate_window(window, self.AI)
-
-            # Evaluar vertical
-            for col in range(self.COLUMNS):
-                col_array = [self.board[row][col] for row in range(self.ROWS)]
-                for row in range(self.ROWS - 3):
-                    window = tuple(col_array[row:row + self.WINDOW_LENGTH])
-                    score += self.evaluate_window(window, self.AI)
-
-            # Evaluar diagonal positiva
+    def evaluate_window(self, window: Tuple[int, ...], piece: int) -> int:
+        """Evalúa una ventana de 4 posiciones"""
+        return self.window_score[window.count(piece)][window.count(self.OPPONENT[piece])]
+
+    def _build_windows(self) -> List[Tuple[Tuple[int, int], ...]]:
+        """Construye las coordenadas de todas las ventanas de 4 casillas del tablero"""
+        windows = []
+        span = range(self.WINDOW_LENGTH)
+
+        # Horizontal
+        for row in range(self.ROWS):
+            for col in range(self.COLUMNS - 3):
+                windows.append(tuple((row, col + i) for i in span))
+
+        # Vertical
+        for col in range(self.COLUMNS):
             for row in range(self.ROWS - 3):
-                for col in range(self.COLUMNS - 3):
-                    window = tuple(self.board[row+i][col+i] for i in range(self.WINDOW_LENGTH))
-                    score += self.evaluate_window(window, self.AI)
+                windows.append(tuple((row + i, col) for i in span))
+
+        # Diagonal positiva
+        for row in range(self.ROWS - 3):
+            for col in range(self.COLUMNS - 3):
+                windows.append(tuple((row + i, col + i) for i in span))
 
-            # Evaluar diagonal negativa
-            for row in range(3, self.ROWS):
-                for col in range(self.COLUMNS - 3):
-                    window = tuple(self.board[row-i][col+i] for i in range(self.WINDOW_LENGTH))
-                    score += self.evaluate_window(window, self.AI)
+        # Diagonal negativa
+        for row in range(3, self.ROWS):
+            for col in range(self.COLUMNS - 3):
+                windows.append(tuple((row - i, col + i) for i in span))
 
-            return score
+        return windows
 
-    def minimax(self, depth: int, alpha: float, beta: float, maximizing_player: bool) -> Tuple[float, Optional[int]]:
+    def _windows_score(self, bit: int) -> int:
+        """Suma la evaluación para la IA de las ventanas que contienen el bit dado"""
+        ai, player = self.pieces[self.AI], self.pieces[self.PLAYER]
+        window_masks, window_score = self.window_masks, self.window_score
+        total = 0
+        for index in self.windows_through[bit]:
+            window_mask = window_masks[index]
+            total += window_score[(ai & window_mask).bit_count()][(player & window_mask).bit_count()]
+        return total
+
+    def evaluate_position(self) -> int:
+        """
+        Evalúa el estado actual del tablero para la IA
+
+        La puntuación (ventanas más control del centro) se mantiene de forma
+        incremental en _place.
+
+        Returns:
+            int: Puntuación del estado actual del tablero
         """
-        Implementa el algoritmo Minimax con poda Alfa-Beta
+        return self.score
+
+    def _init_search_tables(self) -> None:
+        """Prepara los arreglos NumPy que usa la búsqueda compilada"""
+        rows, columns = self.ROWS, self.COLUMNS
+        # Ninguna búsqueda puede bajar más niveles que celdas tiene el tablero
+        max_depth = rows * columns
+
+        # Máscaras de las ventanas que pasan por cada bit, rellenas con 0
+        through_masks = np.zeros(
+            (rows * columns, max(len(w) for w in self.windows_through)), dtype=np.uint64
+        )
+        for bit, indices in enumerate(self.windows_through):
+            through_masks[bit, :len(indices)] = [self.window_masks[i] for i in indices]
+
+        self._geometry = (
+            rows,
+            columns // 2,
+            np.uint64(self.board_mask),
+            np.array(self.bottom_mask, dtype=np.uint64),
+            np.array(self.column_mask, dtype=np.uint64),
+            np.array(self.top_mask, dtype=np.uint64),
+            np.array(self.win_shifts, dtype=np.uint64),
+            np.array(self.win_starts, dtype=np.uint64),
+            np.array(self.column_order, dtype=np.int64),
+            through_masks,
+            np.array(self.window_score, dtype=np.int64),
+            self.zobrist,
+        )
+
+        # Tabla de transposición de direccionamiento directo (se reemplaza siempre)
+        size = 1 << self.TT_SIZE_BITS
+        self._tt = (
+            np.zeros(size, dtype=np.uint64),   # clave Zobrist
+            np.zeros(size, dtype=np.int64),    # valor
+            np.full(size, -1, dtype=np.int8),  # profundidad
+            np.zeros(size, dtype=np.int8),     # tipo de cota
+            np.full(size, -1, dtype=np.int8),  # mejor columna
+        )
+
+        # Jugadas killer por profundidad, buffer de jugadas y contador de nodos
+        self._killers = np.full(max_depth + 1, -1, dtype=np.int64)
+        self._moves_buf = np.zeros((max_depth + 1, columns), dtype=np.int64)
+        self._stats = np.zeros(1, dtype=np.int64)
+
+    def negamax(self, depth: int, alpha: int, beta: int, color: int) -> Tuple[int, Optional[int]]:
+        """
+        Implementa el algoritmo Negamax con poda Alfa-Beta sobre la posición actual
 
         Args:
-            depth: Profundidad actual de búsqueda
+            depth: Profundidad restante de búsqueda
             alpha: Valor alpha para la poda
             beta: Valor beta para la poda
-            maximizing_player: True si es turno del maximizador (IA)
+            color: 1 si mueve la IA, -1 si mueve el jugador humano
 
         Returns:
-            Tuple[float, Optional[int]]: (valor de la posición, mejor columna)
+            Tuple[int, Optional[int]]: (valor de la posición para quien mueve, mejor columna)
+
+        Raises:
+            ValueError: Si la profundidad excede la de los buffers de búsqueda
         """
-        self.nodes_explored += 1
-        valid_moves = self.get_valid_moves()
+        # El núcleo compilado no valida índices: la profundidad debe caber en los buffers
+        if not 0 <= depth < len(self._killers):
+            raise ValueError(f"Profundidad de búsqueda inválida: {depth}")
 
-        # Verificar estados terminales
+        # El núcleo solo revisa las jugadas nuevas; la posición inicial se revisa aquí
         if self.check_winner(self.AI):
-            return (float('inf'), None)
+            return color * (WIN_SCORE + depth), None
         if self.check_winner(self.PLAYER):
-            return (float('-inf'), None)
-        if not valid_moves:
-            return (0, None)
-        if depth == 0:
-            return (self.evaluate_position(), None)
-
-        if maximizing_player:
-            value = float('-inf')
-            column = valid_moves[0]
-            for col in valid_moves:
-                try:
-                    row, _ = self.drop_piece(col, self.AI)
-                    new_score, _ = self.minimax(depth-1, alpha, beta, False)
-                    self.board[row][col] = self.EMPTY  # Deshacer movimiento
-
-                    if new_score > value:
-                        value = new_score
-                        column = col
-                    alpha = max(alpha, value)
-
-                    if alpha >= beta:
-                        break
-
-                except ValueError:
-                    continue
-
-            return value, column
-        else:
-            value = float('inf')
-            column = valid_moves[0]
-            for col in valid_moves:
-                try:
-                    row, _ = self.drop_piece(col, self.PLAYER)
-                    new_score, _ = self.minimax(depth-1, alpha, beta, True)
-                    self.board[row][col] = self.EMPTY  # Deshacer movimiento
-
-                    if new_score < value:
-                        value = new_score
-                        column = col
-                    beta = min(beta, value)
-
-                    if alpha >= beta:
-                        break
-
-                except ValueError:
-                    continue
+            return -color * (WIN_SCORE + depth), None
+
+        self._stats[0] = 0
+        value, column = _negamax(
+            np.array([self.pieces[self.PLAYER], self.pieces[self.AI]], dtype=np.uint64),
+            np.uint64(self.mask),
+            np.uint64(self.hash),
+            self.score,
+            np.array(self.heights, dtype=np.int64),
+            depth, alpha, beta, color,
+            self._geometry, self._tt, self._killers, self._moves_buf, self._stats
+        )
+        self.nodes_explored += int(self._stats[0])
+        return int(value), (int(column) if column >= 0 else None)
+
+    def warm_up(self) -> None:
+        """
+        Compila (o carga desde la caché de Numba) el núcleo de búsqueda
 
-            return value, column
+        Conviene llamarlo antes de abrir la interfaz para que la primera jugada
+        de la IA no incluya el tiempo de compilación.
+        """
+        start_time = time.time()
+        self.negamax(1, -INF, INF, 1)
+        self.nodes_explored = 0
+        logging.info(f"Núcleo de búsqueda listo en {time.time() - start_time:.2f}s")
 
-    def get_ai_move(self) -> Tuple[int, float, int]:
+    def get_ai_move(self, time_budget: Optional[float] = None) -> Tuple[int, float, int]:
         """
-        Obtiene la mejor jugada para la IA
+        Obtiene la mejor jugada para la IA mediante profundización iterativa
+
+        Args:
+            time_budget: Tiempo máximo aproximado en segundos; por defecto según la dificultad
 
         Returns:
             Tuple[int, float, int]: (columna elegida, tiempo de pensamiento, nodos explorados)
@@ -501,14 +815,20 @@ class ConnectFour:
         """
         self.nodes_explored = 0
         start_time = time.time()
+        if time_budget is None:
+            time_budget = self.time_budget_map[self.DIFFICULTY]
 
         try:
-            _, column = self.minimax(
-                self.search_depth,
-                float('-inf'),
-                float('inf'),
-                True
-            )
+            column = None
+            # Cada iteración deja en la tabla de transposición las mejores jugadas
+            # que ordenan la búsqueda de la siguiente profundidad
+            max_depth = min(self.search_depth, len(self._killers) - 1)
+            for depth in range(1, max_depth + 1):
+                value, best = self.negamax(depth, -INF, INF, 1)
+                if best is not None:
+                    column = best
+                if abs(value) >= WIN_SCORE or time.time() - start_time > time_budget:
+                    break
 
             if column is None:
                 raise RuntimeError("No se encontró un movimiento válido")
@@ -539,7 +859,7 @@ class ConnectFour:
         try:
             self.nodes_explored = 0
             # Usar una profundidad menor para la sugerencia
-            _, column = self.minimax(2, float('-inf'), float('inf'), False)
+            _, column = self.negamax(2, -INF, INF, -1)
 
             if column is None or not self.is_valid_move(column):
                 raise RuntimeError("No se pudo generar una sugerencia válida")
@@ -566,10 +886,11 @@ class ConnectFour:
             with self.get_db_connection() as conn:
                 cursor = conn.cursor()
 
-                # Obtener últimas 5 partidas
+                # Obtener últimas 5 partidas terminadas (las en curso no cuentan)
                 cursor.execute('''
                     SELECT winner_player
                     FROM games
+                    WHERE winner_player IS NOT NULL
                     ORDER BY timestamp DESC
                     LIMIT 5
                 ''')
@@ -593,11 +914,18 @@ class ConnectFour:
             # En caso de error, mantener la dificultad actual
             pass
 
+    def close(self) -> None:
+        """Escribe los movimientos pendientes y cierra la conexión"""
+        if hasattr(self, 'conn'):
+            try:
+                self._flush_moves()
+            finally:
+                self.conn.close()
+            logging.info("Conexión a la base de datos cerrada correctamente")
+
     def __del__(self):
         """Destructor para asegurar la limpieza de recursos"""
         try:
-            if hasattr(self, 'conn'):
-                self.conn.close()
-                logging.info("Conexión a la base de datos cerrada correctamente")
+            self.close()
         except Exception as e:
             logging.error(f"Error al cerrar la conexión: {e}")
@@ -2,10 +2,12 @@
 
 import pygame
 import sys
-import math
+import argparse
 import time
 import logging
-from typing import Optional, Tuple
+import queue
+import threading
+from typing import Optional, Tuple, List
 from connect_four import ConnectFour
 
 # Configurar logging
@@ -33,7 +35,8 @@ class ConnectFourGUI:
         'GREEN': (34, 139, 34)
     }
 
-    MOVE_TIMEOUT = 30  # Tiempo máximo por movimiento en segundos
+    MOVE_TIMEOUT_MS = 30_000  # Tiempo máximo por movimiento en milisegundos
+    FPS = 60  # Cuadros por segundo máximos del bucle principal
 
     def __init__(self, game: 'ConnectFour'):
         """
@@ -53,6 +56,7 @@ class ConnectFourGUI:
 
         self.game = game
         self.start_time = time.time()
+        self.clock = pygame.time.Clock()
 
         # Dimensiones
         self.SQUARESIZE = 100
@@ -93,9 +97,30 @@ class ConnectFourGUI:
         # Configurar botones
         self._setup_buttons()
 
+        # Tablero vacío pre-renderizado
+        self._setup_board_surface()
+
         self.suggestion: Optional[int] = None
         self.help_used = False
-        self.last_move_time = time.time()
+        self.last_move_time = pygame.time.get_ticks()
+
+        # Búsqueda de la IA en segundo plano y cola donde deja su resultado
+        self._ai_thread: Optional[threading.Thread] = None
+        self._ai_queue: 'queue.Queue' = queue.Queue()
+
+        # Pantalla de estadísticas finales, renderizada una sola vez
+        self._final_frame: Optional[pygame.Surface] = None
+        # Fondo semi-transparente de esa pantalla, se crea la primera vez que se usa
+        self._stats_overlay: Optional[pygame.Surface] = None
+        # Hilo que guarda las estadísticas finales en la base de datos
+        self._stats_thread: Optional[threading.Thread] = None
+
+        # Indica si el tablero cambió desde el último dibujo
+        self._board_dirty = True
+
+        # Franja superior donde se muestra la ficha que sigue al mouse
+        self._hover_rect = pygame.Rect(0, 0, self.width, self.SQUARESIZE)
+        self._last_hover_col: Optional[int] = None
 
     def _setup_buttons(self):
         """Configura los botones de la interfaz"""
@@ -118,58 +143,87 @@ class ConnectFourGUI:
             button_height
         )
 
+        # Textos de los botones, renderizados una sola vez
+        self.suggest_label = self.FONT_SMALL.render("Sugerir Jugada", 1, self.COLORS['WHITE'])
+        self.suggest_label_rect = self.suggest_label.get_rect(center=self.suggest_button.center)
+        self.close_label = self.FONT_SMALL.render("Cerrar", True, self.COLORS['WHITE'])
+        self.close_label_rect = self.close_label.get_rect(center=self.close_button.center)
+
+    def _setup_board_surface(self):
+        """Dibuja una sola vez el tablero azul con las casillas vacías y las fichas"""
+        self.board_bg = pygame.Surface((self.width, self.game.ROWS * self.SQUARESIZE))
+        self.board_bg.fill(self.COLORS['BLUE'])
+        for c in range(self.game.COLUMNS):
+            for r in range(self.game.ROWS):
+                pygame.draw.circle(
+                    self.board_bg,
+                    self.COLORS['WHITE'],
+                    (int(c*self.SQUARESIZE + self.SQUARESIZE/2),
+                     int(r*self.SQUARESIZE + self.SQUARESIZE/2)),
+                    self.RADIUS
+                )
+        self.board_bg = self.board_bg.convert()
+
+        # Fichas pre-renderizadas con transparencia
+        self.piece_sprites = {}
+        for piece, color in ((self.game.PLAYER, 'RED'), (self.game.AI, 'YELLOW')):
+            sprite = pygame.Surface((self.SQUARESIZE, self.SQUARESIZE), pygame.SRCALPHA)
+            pygame.draw.circle(
+                sprite,
+                self.COLORS[color],
+                (int(self.SQUARESIZE/2), int(self.SQUARESIZE/2)),
+                self.RADIUS
+            )
+            self.piece_sprites[piece] = sprite.convert_alpha()
+
+        # Esquina superior izquierda de cada casilla, en el orden plano del tablero
+        self.cell_positions = [
+            (c*self.SQUARESIZE, (r+1)*self.SQUARESIZE)
+            for r in range(self.game.ROWS) for c in range(self.game.COLUMNS)
+        ]
+
     def draw_board(self):
         """Dibuja el tablero y las fichas"""
+        screen, size = self.screen, self.SQUARESIZE
+        positions, empty, sprites = self.cell_positions, self.game.EMPTY, self.piece_sprites
         try:
             # Limpiar pantalla
-            self.screen.fill(self.COLORS['WHITE'])
+            screen.fill(self.COLORS['WHITE'])
 
             if not self.game_over:
                 # Dibujar botón de sugerencia
-                pygame.draw.rect(self.screen, self.COLORS['GRAY'], self.suggest_button)
-                suggest_text = self.FONT_SMALL.render("Sugerir Jugada", 1, self.COLORS['WHITE'])
-                suggest_text_rect = suggest_text.get_rect(center=self.suggest_button.center)
-                self.screen.blit(suggest_text, suggest_text_rect)
-
-            # Dibujar tablero
-            for c in range(self.game.COLUMNS):
-                for r in range(self.game.ROWS):
-                    pygame.draw.rect(
-                        self.screen,
-                        self.COLORS['BLUE'],
-                        (c*self.SQUARESIZE, (r+1)*self.SQUARESIZE, self.SQUARESIZE, self.SQUARESIZE)
-                    )
-
-                    color = self.COLORS['WHITE']
-                    if self.game.board[r][c] == self.game.PLAYER:
-                        color = self.COLORS['RED']
-                    elif self.game.board[r][c] == self.game.AI:
-                        color = self.COLORS['YELLOW']
-
-                    pygame.draw.circle(
-                        self.screen,
-                        color,
-                        (int(c*self.SQUARESIZE + self.SQUARESIZE/2),
-                         int((r+1)*self.SQUARESIZE + self.SQUARESIZE/2)),
-                        self.RADIUS
-                    )
-
-            # Dibujar sugerencia
-            if self.suggestion is not None:
-                pygame.draw.circle(
-                    self.screen,
-                    self.COLORS['GRAY'],
-                    (int(self.suggestion*self.SQUARESIZE + self.SQUARESIZE/2),
-                     self.SQUARESIZE/2),
-                    self.RADIUS/2
-                )
+                pygame.draw.rect(screen, self.COLORS['GRAY'], self.suggest_button)
+                screen.blit(self.suggest_label, self.suggest_label_rect)
+
+            # Dibujar tablero y, en una sola llamada, las fichas colocadas
+            screen.blit(self.board_bg, (0, size))
+            screen.blits(
+                [(sprites[cell], position)
+                 for position, cell in zip(positions, self.game.board) if cell != empty],
+                doreturn=0
+            )
+
+            self._draw_suggestion()
 
             pygame.display.update()
+            # La franja superior quedó limpia; la ficha flotante debe redibujarse
+            self._last_hover_col = None
 
         except pygame.error as e:
             logging.error(f"Error al dibujar el tablero: {e}")
             raise GameError("Error al actualizar la pantalla")
 
+    def _draw_suggestion(self):
+        """Dibuja la marca de la columna sugerida en la franja superior"""
+        if self.suggestion is not None:
+            pygame.draw.circle(
+                self.screen,
+                self.COLORS['GRAY'],
+                (int(self.suggestion*self.SQUARESIZE + self.SQUARESIZE/2),
+                 self.SQUARESIZE/2),
+                self.RADIUS/2
+            )
+
     def show_stats(self, thinking_time: float, nodes: int):
         """Muestra estadísticas de la IA"""
         try:
@@ -177,8 +231,7 @@ class ConnectFourGUI:
             self.stats['total_ai_nodes'] += nodes
             stats_text = f"Tiempo: {thinking_time:.2f}s | Nodos: {nodes}"
             label = self.FONT_SMALL.render(stats_text, 1, self.COLORS['BLACK'])
-            self.screen.blit(label, (self.width - 300, 20))
-            pygame.display.update()
+            pygame.display.update(self.screen.blit(label, (self.width - 300, 20)))
         except Exception as e:
             logging.error(f"Error al mostrar estadísticas: {e}")
 
@@ -187,25 +240,22 @@ class ConnectFourGUI:
         try:
             label = self.FONT.render(f"¡{winner} ha ganado!", 1, self.COLORS['BLACK'])
             label_rect = label.get_rect(center=(self.width//2, 40))
-            self.screen.blit(label, label_rect)
-            pygame.display.update()
+            pygame.display.update(self.screen.blit(label, label_rect))
             logging.info(f"Juego terminado. Ganador: {winner}")
         except Exception as e:
             logging.error(f"Error al mostrar fin de juego: {e}")
 
     def check_move_timeout(self) -> bool:
         """Verifica si se ha excedido el tiempo límite para un movimiento"""
-        current_time = time.time()
-        if current_time - self.last_move_time > self.MOVE_TIMEOUT:
+        if pygame.time.get_ticks() - self.last_move_time > self.MOVE_TIMEOUT_MS:
             logging.warning("Tiempo de movimiento excedido")
             return True
         return False
 
     def get_mouse_pos_column(self, pos_x: int) -> Optional[int]:
         """Convierte la posición del mouse a columna del tablero"""
-        if 0 <= pos_x < self.width:
-            return int(math.floor(pos_x/self.SQUARESIZE))
-        return None
+        col = pos_x // self.SQUARESIZE
+        return col if 0 <= col < self.game.COLUMNS else None
 
     def show_final_stats(self, winner: str):
         """
@@ -234,18 +284,19 @@ class ConnectFourGUI:
                 'nivel_dificultad': self.game.DIFFICULTY
             }
 
-            # Guardar estadísticas en la base de datos
-            try:
-                self.game.register_game_stats(stats_data)
-            except Exception as e:
-                logging.error(f"Error al registrar estadísticas en BD: {e}")
-                # Continuar con la visualización aunque falle el registro
+            # Guardar estadísticas en la base de datos en segundo plano para
+            # no retrasar la pantalla final
+            self._stats_thread = threading.Thread(
+                target=self._save_game_stats, args=(stats_data,), daemon=True
+            )
+            self._stats_thread.start()
 
-            # Crear superficie semi-transparente para el fondo
-            stats_surface = pygame.Surface((self.width, self.height))
-            stats_surface.fill(self.COLORS['WHITE'])
-            stats_surface.set_alpha(240)
-            self.screen.blit(stats_surface, (0, 0))
+            # Superficie semi-transparente para el fondo
+            if self._stats_overlay is None:
+                self._stats_overlay = pygame.Surface((self.width, self.height)).convert()
+                self._stats_overlay.fill(self.COLORS['WHITE'])
+                self._stats_overlay.set_alpha(240)
+            self.screen.blit(self._stats_overlay, (0, 0))
 
             # Dibujar fondo del título
             title_rect = pygame.Rect(0, self.height//4 - 40, self.width, 40)
@@ -272,20 +323,20 @@ class ConnectFourGUI:
                 f""
             ]
 
-            # Dibujar estadísticas
+            # Dibujar estadísticas en una sola llamada
             y_offset = self.height//4 + 20
-            for stat in stats:
+            lines = []
+            for i, stat in enumerate(stats):
                 text = self.FONT_STATS.render(stat, True, self.COLORS['BLACK'])
-                text_rect = text.get_rect(center=(self.width//2, y_offset))
-                self.screen.blit(text, text_rect)
-                y_offset += 30
+                lines.append((text, text.get_rect(center=(self.width//2, y_offset + 30*i))))
+            self.screen.blits(lines, doreturn=0)
 
             # Dibujar botón de cerrar
             pygame.draw.rect(self.screen, self.COLORS['RED'], self.close_button)
-            close_text = self.FONT_SMALL.render("Cerrar", True, self.COLORS['WHITE'])
-            close_rect = close_text.get_rect(center=self.close_button.center)
-            self.screen.blit(close_text, close_rect)
+            self.screen.blit(self.close_label, self.close_label_rect)
 
+            # Guardar la pantalla final para reponerla sin volver a renderizarla
+            self._final_frame = self.screen.copy()
             pygame.display.update()
 
         except Exception as e:
@@ -295,28 +346,26 @@ class ConnectFourGUI:
     def run_game(self):
         """Ejecuta el bucle principal del juego"""
         try:
-            # Si la IA comienza, hacer su primera jugada
-            if self.turn == 1:
-                col, thinking_time, nodes = self.game.get_ai_move()
-                if self.game.is_valid_move(col):
-                    self.game.drop_piece(col, self.game.AI, False)
-                    self.show_stats(thinking_time, nodes)
-                    self.stats['ai_moves'] += 1
-                    self.turn = 0
-                    self.last_move_time = time.time()
+            # Partida en curso
+            while not self.game_over:
+                # Limitar la velocidad del bucle para no ocupar la CPU sin necesidad
+                self.clock.tick(self.FPS)
 
-            while True:
-                if not self.game_over:
+                if self._board_dirty:
                     self.draw_board()
+                    self._board_dirty = False
 
-                    # Verificar timeout
-                    if self.check_move_timeout():
-                        self.game_over = True
-                        winner = "IA" if self.turn == 0 else "Jugador"
-                        self.show_game_over(f"{winner} (por tiempo)")
-                        self.show_final_stats(winner.upper())
-                        break
-
+                # Verificar timeout
+                if self.check_move_timeout():
+                    self.game_over = True
+                    winner = "IA" if self.turn == 0 else "Jugador"
+                    self.show_game_over(f"{winner} (por tiempo)")
+                    self.show_final_stats(winner.upper())
+                    self._wait_for_stats()
+                    return
+
+                # De los movimientos del mouse solo interesa el último de la cola
+                last_motion = None
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         self.cleanup()
@@ -327,51 +376,50 @@ class ConnectFourGUI:
                         if self.game_over:  # Si el juego terminó después de procesar el click
                             continue  # Mantener el bucle para mostrar estadísticas
 
-                    elif event.type == pygame.MOUSEMOTION and not self.game_over:
-                        self._handle_mouse_motion(event.pos)
+                    elif event.type == pygame.MOUSEMOTION:
+                        last_motion = event
 
-                # Turno de la IA
-                if not self.game_over and self.turn == 1:
-                    try:
-                        col, thinking_time, nodes = self.game.get_ai_move()
-                        if self.game.is_valid_move(col):
-                            self.game.drop_piece(col, self.game.AI, False)
-                            self.show_stats(thinking_time, nodes)
-                            self.stats['ai_moves'] += 1
-                            self.last_move_time = time.time()
-
-                            if self.game.check_winner(self.game.AI):
-                                self.show_game_over("IA")
-                                self.game_over = True
-                                self.game.adjust_difficulty(False)
-                                self.show_final_stats("AI")
-                                continue  # Mantener el bucle para mostrar estadísticas
-                            else:
-                                self.turn = 0
-                    except Exception as e:
-                        logging.error(f"Error en turno de IA: {e}")
-                        self.cleanup()
-                        raise
+                if last_motion is not None and not self.game_over:
+                    self._handle_mouse_motion(last_motion.pos)
 
-                # Verificar empate
-                if not self.game_over and len(self.game.get_valid_moves()) == 0:
-                    self.show_game_over("Empate")
-                    self.game_over = True
-                    self.show_final_stats("EMPATE")
-
-                # Si el juego terminó, esperar a que el jugador cierre la ventana
-                if self.game_over:
-                    waiting_for_close = True
-                    while waiting_for_close:
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
+                # Turno de la IA: la búsqueda corre en otro hilo y aquí solo se
+                # consulta si ya terminó, sin bloquear la ventana
+                if not self.game_over and self.turn == 1:
+                    if self._ai_thread is None:
+                        self._start_ai_turn()
+                    else:
+                        try:
+                            result = self._ai_queue.get_nowait()
+                        except queue.Empty:
+                            result = None
+
+                        if result is not None:
+                            self._ai_thread = None
+                            try:
+                                if isinstance(result, Exception):
+                                    raise result
+                                self._handle_ai_turn(*result)
+                            except Exception as e:
+                                logging.error(f"Error en turno de IA: {e}")
                                 self.cleanup()
-                                return
-                            if event.type == pygame.MOUSEBUTTONDOWN:
-                                pos_x, pos_y = event.pos
-                                if self.close_button.collidepoint(pos_x, pos_y):
-                                    self.cleanup()
-                                    return
+                                raise
+
+            # Partida terminada: esperar (bloqueado) a que el jugador cierre la ventana
+            while True:
+                event = pygame.event.wait()
+                if event.type == pygame.QUIT:
+                    self.cleanup()
+                    return
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # La ventana volvió a ser visible: reponer la pantalla final
+                    if self._final_frame is not None:
+                        self.screen.blit(self._final_frame, (0, 0))
+                        pygame.display.update()
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    pos_x, pos_y = event.pos
+                    if self.close_button.collidepoint(pos_x, pos_y):
+                        self.cleanup()
+                        return
 
         except Exception as e:
             logging.error(f"Error en el bucle principal: {str(e)}")
@@ -387,9 +435,13 @@ class ConnectFourGUI:
                 self.cleanup()
                 sys.exit()
         else:
-            # Verificar click en botón de sugerencia
+            # Verificar click en botón de sugerencia (no mientras la IA piensa,
+            # ya que ambas búsquedas comparten las tablas del juego)
             if self.suggest_button.collidepoint(pos_x, pos_y):
+                if self._ai_thread is not None:
+                    return
                 self.suggestion = self.game.suggest_move()
+                self._board_dirty = True
                 self.help_used = True
                 self.stats['suggestions_used'] += 1
                 return
@@ -403,59 +455,96 @@ class ConnectFourGUI:
     def _handle_mouse_motion(self, pos):
         """Maneja el movimiento del mouse"""
         try:
-            pygame.draw.rect(self.screen, self.COLORS['WHITE'], (0, 0, self.width, self.SQUARESIZE))
             pos_x = pos[0]
             col = self.get_mouse_pos_column(pos_x)
+            if col == self._last_hover_col:
+                return
+            self._last_hover_col = col
+
+            pygame.draw.rect(self.screen, self.COLORS['WHITE'], self._hover_rect)
+            self._draw_suggestion()
             if col is not None:
-                pygame.draw.circle(
-                    self.screen,
-                    self.COLORS['RED'],
-                    (int(col*self.SQUARESIZE + self.SQUARESIZE/2), int(self.SQUARESIZE/2)),
-                    self.RADIUS
-                )
-            pygame.display.update()
+                self.screen.blit(self.piece_sprites[self.game.PLAYER], (col*self.SQUARESIZE, 0))
+            pygame.display.update(self._hover_rect)
         except pygame.error as e:
             logging.error(f"Error al manejar movimiento del mouse: {e}")
 
     def _handle_player_move(self, col: int):
         """Maneja el movimiento del jugador"""
-        self.game.drop_piece(col, self.game.PLAYER, self.help_used)
+        self.game.apply_move(col, self.game.PLAYER, self.help_used)
         self.help_used = False
         self.suggestion = None
+        self._board_dirty = True
         self.stats['human_moves'] += 1
-        self.last_move_time = time.time()
+        self.last_move_time = pygame.time.get_ticks()
 
         if self.game.check_winner(self.game.PLAYER):
             self.show_game_over("Jugador")
             self.game_over = True
             self.game.adjust_difficulty(True)
             self.show_final_stats("HUMAN")
+        elif self.game.is_full():
+            self._handle_draw()
         else:
             self.turn = 1
 
-    def _handle_ai_turn(self):
-        """Maneja el turno de la IA"""
-        col, thinking_time, nodes = self.game.get_ai_move()
+    def _start_ai_turn(self):
+        """Lanza la búsqueda de la IA en un hilo de fondo"""
+        self._ai_thread = threading.Thread(target=self._run_ai_search, daemon=True)
+        self._ai_thread.start()
 
+    def _run_ai_search(self):
+        """Calcula la jugada de la IA y deja el resultado (o el error) en la cola"""
+        try:
+            self._ai_queue.put(self.game.get_ai_move())
+        except Exception as e:
+            self._ai_queue.put(e)
+
+    def _handle_ai_turn(self, col: int, thinking_time: float, nodes: int):
+        """Aplica la jugada calculada por la IA"""
         if self.game.is_valid_move(col):
-            self.game.drop_piece(col, self.game.AI, False)
+            self.game.apply_move(col, self.game.AI, False)
+            self._board_dirty = True
             self.show_stats(thinking_time, nodes)
             self.stats['ai_moves'] += 1
-            self.last_move_time = time.time()
+            self.last_move_time = pygame.time.get_ticks()
 
             if self.game.check_winner(self.game.AI):
                 self.show_game_over("IA")
                 self.game_over = True
                 self.game.adjust_difficulty(False)
                 self.show_final_stats("AI")
+            elif self.game.is_full():
+                self._handle_draw()
             else:
                 self.turn = 0
 
+    def _save_game_stats(self, stats_data: dict):
+        """Registra las estadísticas finales (se ejecuta en un hilo aparte)"""
+        try:
+            self.game.register_game_stats(stats_data)
+        except Exception as e:
+            logging.error(f"Error al registrar estadísticas en BD: {e}")
+
+    def _wait_for_stats(self, timeout: float = 2.0):
+        """Espera a que terminen de guardarse las estadísticas, si hay un guardado en curso"""
+        if self._stats_thread is not None:
+            self._stats_thread.join(timeout)
+            if self._stats_thread.is_alive():
+                logging.warning("El guardado de estadísticas no terminó a tiempo")
+            self._stats_thread = None
+
+    def _handle_draw(self):
+        """Termina la partida en empate (tablero lleno sin ganador)"""
+        self.show_game_over("Empate")
+        self.game_over = True
+        self.show_final_stats("EMPATE")
+
     def cleanup(self):
         """Limpia los recursos antes de cerrar"""
         try:
-            if hasattr(self.game, 'conn'):
-                self.game.conn.close()
+            self._wait_for_stats()
+            self.game.close()
             pygame.quit()
         except Exception as e:
             logging.error(f"Error durante la limpieza: {e}")
@@ -521,23 +610,48 @@ def validate_config(rows: int, columns: int, difficulty: int) -> bool:
         raise ValueError("Nivel de dificultad inválido")
     return True
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Lee la configuración opcional del juego desde la línea de comandos
+
+    Las opciones omitidas se preguntan luego por consola.
+
+    Args:
+        argv: Argumentos a analizar; por defecto sys.argv
+
+    Returns:
+        argparse.Namespace: Opciones size, difficulty y first (None si se omiten)
+    """
+    parser = argparse.ArgumentParser(description="Connect Four con IA")
+    parser.add_argument('--size', choices=['normal', 'small'],
+                        help="Tamaño del tablero: normal (6x7) o small (5x4)")
+    parser.add_argument('--difficulty', type=int, choices=[1, 2, 3],
+                        help="Nivel de dificultad: 1 (fácil), 2 (medio) o 3 (difícil)")
+    parser.add_argument('--first', choices=['human', 'ai'],
+                        help="Jugador que comienza la partida")
+    return parser.parse_args(argv)
+
 def main():
     """Función principal para iniciar el juego con validación de entradas"""
+    args = parse_args()
     try:
         print("Bienvenido a Connect Four con IA!")
         logging.info("Iniciando nuevo juego")
 
         # Validación del tamaño del tablero
-        print("\nSeleccione el tamaño del tablero:")
-        print("1. Normal (6x7)")
-        print("2. Pequeño (5x4)")
-
-        size_choice = validate_input(
-            "Opción (1-2): ",
-            1,
-            2,
-            "Error: Seleccione 1 para tablero normal o 2 para tablero pequeño"
-        )
+        if args.size is not None:
+            size_choice = 1 if args.size == 'normal' else 2
+        else:
+            print("\nSeleccione el tamaño del tablero:")
+            print("1. Normal (6x7)")
+            print("2. Pequeño (5x4)")
+
+            size_choice = validate_input(
+                "Opción (1-2): ",
+                1,
+                2,
+                "Error: Seleccione 1 para tablero normal o 2 para tablero pequeño"
+            )
 
         # Establecer dimensiones según la elección
         if size_choice == 2:
@@ -546,29 +660,35 @@ def main():
             rows, columns = 6, 7
 
         # Validación de la dificultad
-        print("\nSeleccione el nivel de dificultad:")
-        print("1. Fácil")
-        print("2. Medio")
-        print("3. Difícil")
-
-        difficulty = validate_input(
-            "Opción (1-3): ",
-            1,
-            3,
-            "Error: Seleccione un nivel de dificultad válido (1-3)"
-        )
+        if args.difficulty is not None:
+            difficulty = args.difficulty
+        else:
+            print("\nSeleccione el nivel de dificultad:")
+            print("1. Fácil")
+            print("2. Medio")
+            print("3. Difícil")
+
+            difficulty = validate_input(
+                "Opción (1-3): ",
+                1,
+                3,
+                "Error: Seleccione un nivel de dificultad válido (1-3)"
+            )
 
         # Validación del jugador inicial
-        print("\n¿Quién comienza el juego?")
-        print("1. Jugador Humano")
-        print("2. IA")
-
-        player_choice = validate_input(
-            "Opción (1-2): ",
-            1,
-            2,
-            "Error: Seleccione 1 para jugador humano o 2 para IA"
-        )
+        if args.first is not None:
+            player_choice = 1 if args.first == 'human' else 2
+        else:
+            print("\n¿Quién comienza el juego?")
+            print("1. Jugador Humano")
+            print("2. IA")
+
+            player_choice = validate_input(
+                "Opción (1-2): ",
+                1,
+                2,
+                "Error: Seleccione 1 para jugador humano o 2 para IA"
+            )
 
         initial_player = "HUMAN" if player_choice == 1 else "AI"
 
@@ -585,6 +705,7 @@ def main():
                 difficulty=difficulty,
                 initial_player=initial_player
             )
+            game.warm_up()
             gui = ConnectFourGUI(game)
             gui.run_game()
 
@@ -611,9 +732,8 @@ def main():
     finally:
         # Asegurar que la conexión a la base de datos se cierre correctamente
         try:
-            if 'game' in locals() and hasattr(game, 'conn'):
-                game.conn.close()
-                logging.info("Conexión a la base de datos cerrada correctamente")
+            if 'game' in locals():
+                game.close()
         except Exception as e:
             logging.error(f"Error al cerrar la conexión a la base de datos: {str(e)}")
 